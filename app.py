@@ -1,11 +1,11 @@
 import streamlit as st
-import feedparser
 from components import (
     load_custom_css, render_header, render_hero, render_tabs,
     render_search_section, render_article_card
 )
 from news_utils import (
-    build_google_news_rss_url, get_sentiment, get_source_icon, format_time_ago
+    build_google_news_rss_url, iter_google_news_entries, PENDING_ENRICHMENT,
+    enrich_article
 )
 from visualizations import render_insights_section
 from chat_bot import render_chat_section
@@ -24,6 +24,11 @@ st.set_page_config(
 # → The function loads an external stylesheet so the app has a polished UI.
 load_custom_css()
 
+# Upper bound of the "Maximum articles to display" slider
+# → Also the early-exit limit per keyword's feed, applied only with "Relevance"
+#   sorting and no sentiment filter; every other setting reads the whole feed.
+MAX_ARTICLES = 20
+
 
 # Main entry point of the app – calls all UI sections and handles logic
 def main():
@@ -68,10 +73,13 @@ def main():
     # Advanced search options (hidden inside an expander)
     # → Lets user customize number of articles, sorting, and sentiment filters.
     with st.expander("Advanced Options"):
-        max_articles = st.slider("Maximum articles to display", 5, 20, 10)
+        max_articles = st.slider("Maximum articles to display", 5, MAX_ARTICLES, 10)
         sort_by = st.selectbox("Sort by", ["Published Date", "Relevance", "Sentiment"])
         show_only = st.multiselect("Show only", ["Positive", "Negative", "Neutral"], default=["Positive", "Negative", "Neutral"])
 
+    # Placeholder for the statistics row, set once articles are fetched
+    metrics_slot = None
+
     # If user clicked "Fetch" and provided keywords → start fetching news
     if fetch_btn and rss_urls:
         # Show a section header for results
@@ -83,93 +91,111 @@ def main():
         </div>
         """, unsafe_allow_html=True)
 
+        # A sentiment filter or a non-feed sort order needs the whole feed
+        # → Only when the page shows the feed in its own order can reading stop early.
+        sentiment_map = {"Positive": "😊 Positive", "Negative": "😞 Negative", "Neutral": "😐 Neutral"}
+        filter_by_sentiment = show_only and len(show_only) < len(sentiment_map)
+        feed_limit = MAX_ARTICLES if not filter_by_sentiment and sort_by == "Relevance" else None
+
         with st.spinner("Fetching latest news..."):  # Show loading animation
             all_articles = []
 
-            # For each keyword, fetch RSS feed and parse news articles
-            # → Extracts title, link, date, and runs AI sentiment analysis.
+            # For each keyword, stream the RSS feed and collect the raw headlines
+            # → Extracts title, link and date; sentiment and source are filled in later.
+            # → Stops reading a feed after feed_limit entries, if a limit applies.
             for kw, url in zip(keywords, rss_urls):
                 try:
-                    feed = feedparser.parse(url)
-                    for entry in feed.entries:
-                        sentiment_text, sentiment_class = get_sentiment(entry.title)
+                    for entry in iter_google_news_entries(url, feed_limit):
                         article = {
-                            "title": entry.title,
-                            "link": entry.link,
-                            "published": entry.get("published", "No date"),
+                            "title": entry["title"],
+                            "link": entry["link"],
+                            "published": entry["published"] or "No date",
                             "keyword": kw,
-                            "sentiment": sentiment_text,
-                            "sentiment_class": sentiment_class,
-                            "source_icon": get_source_icon(entry.title),
-                            "time_ago": format_time_ago(entry.get("published", ""))
+                            **PENDING_ENRICHMENT
                         }
                         all_articles.append(article)
                 except Exception as e:
                     st.error(f"Error fetching news for '{kw}': {str(e)}")
 
-            if all_articles:
-                # Apply sentiment filters chosen by user
-                # → Only show Positive, Negative, or Neutral articles if selected.
-                sentiment_map = {"Positive": "😊 Positive", "Negative": "😞 Negative", "Neutral": "😐 Neutral"}
-                if show_only:
-                    selected_sentiments = [sentiment_map[s] for s in show_only]
-                    all_articles = [a for a in all_articles if a["sentiment"] in selected_sentiments]
-
-                # Sort articles by date or sentiment
-                # → Ensures the most relevant/desired results are shown first.
-                if sort_by == "Published Date":
-                    all_articles.sort(key=lambda x: x["published"], reverse=True)
-                elif sort_by == "Sentiment":
-                    sentiment_order = {"😊 Positive": 0, "😐 Neutral": 1, "😞 Negative": 2}
-                    all_articles.sort(key=lambda x: sentiment_order.get(x["sentiment"], 3))
-
-                top_articles = all_articles[:max_articles]
-
-                # Display quick statistics about fetched articles
-                # → Shows total count and sentiment breakdown using metrics.
-                if all_articles:
-                    col1, col2, col3, col4 = st.columns(4)
-                    with col1:
-                        st.metric("Total Articles", len(all_articles))
-                    with col2:
-                        positive_count = len([a for a in all_articles if "Positive" in a["sentiment"]])
-                        st.metric("Positive", positive_count)
-                    with col3:
-                        negative_count = len([a for a in all_articles if "Negative" in a["sentiment"]])
-                        st.metric("Negative", negative_count)
-                    with col4:
-                        neutral_count = len([a for a in all_articles if "Neutral" in a["sentiment"]])
-                        st.metric("Neutral", neutral_count)
-
-                    st.markdown("---")
-
-                # Display featured and regular articles in a nice layout
-                # → First 3 articles are highlighted, rest shown below.
-                if len(top_articles) >= 3:
-                    st.markdown("### Featured Articles")
-
-                    render_article_card(top_articles[0], is_featured=True)
-
-                    col1, col2 = st.columns(2)
-                    with col1:
-                        render_article_card(top_articles[1])
-                    with col2:
-                        render_article_card(top_articles[2])
-
-                    if len(top_articles) > 3:
-                        st.markdown("### More Headlines")
-                        for article in top_articles[3:]:
-                            render_article_card(article)
-                else:
-                    for article in top_articles:
-                        render_article_card(article)
-
-                # Show extra insights/visualizations after the articles
-                # → Could include charts like sentiment distribution.
-                st.markdown("---")
-                render_insights_section(top_articles)
+        if all_articles:
+            # Sentiment and source results are cached per link for the session
+            # → Articles seen on an earlier fetch are never analyzed twice.
+            # → Only links from this fetch are kept, so the cache never outgrows one fetch.
+            previous_cache = st.session_state.get("enrichment_cache", {})
+            enrichment_cache = {
+                a["link"]: previous_cache[a["link"]] for a in all_articles if a["link"] in previous_cache
+            }
+            st.session_state.enrichment_cache = enrichment_cache
+
+            # Filtering or sorting by sentiment needs every article enriched up front
+            # → Otherwise raw headlines are shown right away and enriched in place.
+            if filter_by_sentiment or sort_by == "Sentiment":
+                with st.spinner("Analyzing sentiment..."):
+                    for article in all_articles:
+                        enrich_article(article, enrichment_cache)
+
+            # Apply sentiment filters chosen by user
+            # → Only show Positive, Negative, or Neutral articles if selected.
+            if filter_by_sentiment:
+                selected_sentiments = [sentiment_map[s] for s in show_only]
+                all_articles = [a for a in all_articles if a["sentiment"] in selected_sentiments]
+
+            # Sort articles by date or sentiment
+            # → Ensures the most relevant/desired results are shown first.
+            if sort_by == "Published Date":
+                all_articles.sort(key=lambda x: x["published"], reverse=True)
+            elif sort_by == "Sentiment":
+                sentiment_order = {"😊 Positive": 0, "😐 Neutral": 1, "😞 Negative": 2}
+                all_articles.sort(key=lambda x: sentiment_order.get(x["sentiment"], 3))
+
+            top_articles = all_articles[:max_articles]
+
+            # Reserve space for quick statistics above the articles
+            # → Filled in at the very end, once every article has been enriched.
+            metrics_slot = st.empty()
+
+            # Lay out featured and regular article slots in a nice layout
+            # → First 3 articles are highlighted, rest shown below.
+            # → Each slot is a placeholder, so a card can be redrawn once it is enriched.
+            card_slots = []
+            if len(top_articles) >= 3:
+                st.markdown("### Featured Articles")
+
+                card_slots.append((st.empty(), True))
+
+                col1, col2 = st.columns(2)
+                with col1:
+                    card_slots.append((st.empty(), False))
+                with col2:
+                    card_slots.append((st.empty(), False))
+
+                if len(top_articles) > 3:
+                    st.markdown("### More Headlines")
+                    for _ in top_articles[3:]:
+                        card_slots.append((st.empty(), False))
             else:
-                st.warning("No articles found. Please try different keywords.")
+                for _ in top_articles:
+                    card_slots.append((st.empty(), False))
+
+            # Show the headlines immediately, before any enrichment runs
+            for (slot, is_featured), article in zip(card_slots, top_articles):
+                with slot.container():
+                    render_article_card(article, is_featured=is_featured)
+
+            # Enrich the displayed articles in order and redraw each card in place
+            # → Cards that were already enriched above are left as they are.
+            for (slot, is_featured), article in zip(card_slots, top_articles):
+                if not article["enriched"]:
+                    enrich_article(article, enrichment_cache)
+                    with slot.container():
+                        render_article_card(article, is_featured=is_featured)
+
+            # Show extra insights/visualizations after the articles
+            # → Could include charts like sentiment distribution.
+            st.markdown("---")
+            render_insights_section(top_articles)
+        else:
+            st.warning("No articles found. Please try different keywords.")
 
     elif fetch_btn:
         # User clicked fetch but gave no keywords
@@ -180,6 +206,35 @@ def main():
     # → Allows users to interact and ask questions about the news.
     render_chat_section()
 
+    # Display quick statistics about fetched articles
+    # → The articles that are not displayed are only needed here, so they are
+    #   enriched last, on the script thread, once everything else is on screen.
+    #   (Sentiment analysis is pure Python and holds the GIL, so a worker pool
+    #   would not make this any faster.)
+    # → Shows total count and sentiment breakdown using metrics.
+    if metrics_slot is not None and all_articles:
+        for article in all_articles[max_articles:]:
+            enrich_article(article, enrichment_cache)
+        with metrics_slot.container():
+            col1, col2, col3, col4 = st.columns(4)
+            with col1:
+                st.metric("Total Articles", len(all_articles))
+            with col2:
+                positive_count = len([a for a in all_articles if "Positive" in a["sentiment"]])
+                st.metric("Positive", positive_count)
+            with col3:
+                negative_count = len([a for a in all_articles if "Negative" in a["sentiment"]])
+                st.metric("Negative", negative_count)
+            with col4:
+                neutral_count = len([a for a in all_articles if "Neutral" in a["sentiment"]])
+                st.metric("Neutral", neutral_count)
+
+            # Make it clear when the feeds were not read in full
+            if feed_limit:
+                st.caption(f"Statistics cover the first {feed_limit} headlines for each keyword.")
+
+            st.markdown("---")
+
 
 # Run the app if this file is executed directly
 if __name__ == "__main__":
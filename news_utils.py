@@ -2,15 +2,135 @@ from textblob import TextBlob
 from urllib.parse import quote_plus
 import feedparser
 import datetime
+import re
+import urllib.request
+from xml.etree import ElementTree
 from dateutil import parser
 
 
+# Fields the fast path pulls out of each Google News <item>, mapped to the
+# names feedparser uses for the same data so callers can treat both the same
+GOOGLE_NEWS_ITEM_FIELDS = {"title": "title", "link": "link", "pubDate": "published", "guid": "id"}
+
+# Text that still contains markup or an entity after XML decoding is treated as HTML by
+# feedparser (which then sanitizes and re-escapes it), so the fast path hands it over instead
+HTML_LIKE_TEXT = re.compile(r"<|&#?\w+;")
+
+# Placeholder values shown on an article card until its enrichment arrives
+PENDING_ENRICHMENT = {
+    "sentiment": "⏳ Analyzing",
+    "sentiment_class": "sentiment-pending",
+    "source_icon": "···",
+    "time_ago": "…",
+    "enriched": False,
+}
+
+# Values shown on an article card when its enrichment raised an error.
+# Failed articles carry no sentiment, so they stay out of the sentiment counts.
+FAILED_ENRICHMENT = {
+    "sentiment": "⚠️ Unavailable",
+    "sentiment_class": "sentiment-pending",
+    "source_icon": "···",
+    "time_ago": "",
+    "enriched": True,
+    "enrichment_failed": True,
+}
+
+
 # This function builds the RSS URL for the searched keyword
 def build_google_news_rss_url(keyword: str) -> str:
     q = quote_plus(keyword.strip())
     return f"https://news.google.com/rss/search?q={q}&hl=en-US&gl=US&ceid=US:en"
 
 
+# This function turns a feedparser entry into the same plain dict the fast path yields,
+# so callers get identical keys no matter which parser produced the entry
+def _entry_from_feedparser(entry) -> dict:
+    source = entry.get("source", {})
+    return {
+        "title": entry.get("title", ""),
+        "link": entry.get("link", ""),
+        "published": entry.get("published", ""),
+        "source": {"title": source.get("title", ""), "href": source.get("href", "")},
+        "id": entry.get("id", ""),
+    }
+
+
+# This function turns one Google News <item> element into an entry dict.
+# Anything that does not look like a plain Google News item raises ValueError
+# so the caller can fall back to feedparser.
+def _entry_from_item(item) -> dict:
+    entry = {"source": {"title": "", "href": ""}, "published": "", "id": ""}
+    for child in item:
+        if len(child):
+            raise ValueError(f"unexpected nested markup in <{child.tag}>")
+        if child.tag in GOOGLE_NEWS_ITEM_FIELDS:
+            entry[GOOGLE_NEWS_ITEM_FIELDS[child.tag]] = (child.text or "").strip()
+        elif child.tag == "source":
+            entry["source"] = {"title": (child.text or "").strip(), "href": child.get("url", "")}
+    if not entry.get("title") or not entry.get("link"):
+        raise ValueError("item without title or link")
+    if HTML_LIKE_TEXT.search(entry["title"]) or HTML_LIKE_TEXT.search(entry["source"]["title"]):
+        raise ValueError("text that feedparser would treat as HTML")
+    return entry
+
+
+# This class wraps an HTTP response and keeps a copy of every byte read from it,
+# so a feed that the fast path gives up on can be handed to feedparser without refetching it
+class _RecordingReader:
+    def __init__(self, stream):
+        self.stream = stream
+        self.chunks = []
+
+    def read(self, size=-1):
+        data = self.stream.read(size)
+        self.chunks.append(data)
+        return data
+
+    # Everything read so far plus the rest of the stream
+    def replay(self) -> bytes:
+        return b"".join(self.chunks) + self.stream.read()
+
+
+# This function streams a Google News RSS feed and yields entries one by one.
+# It stops reading the feed as soon as `max_results` entries have been yielded,
+# so short result lists never download or parse the whole document.
+# If the feed contains anything unexpected, the remaining entries come from feedparser instead,
+# parsed from the same download. Network errors are raised to the caller.
+def iter_google_news_entries(url: str, max_results: int = None):
+    if max_results is not None and max_results <= 0:
+        return
+
+    yielded_keys = set()
+    request = urllib.request.Request(url, headers={"User-Agent": "Mozilla/5.0 (Newsly.AI)"})
+    with urllib.request.urlopen(request, timeout=10) as response:
+        reader = _RecordingReader(response)
+        try:
+            context = ElementTree.iterparse(reader, events=("start", "end"))
+            _, root = next(context)
+            if root.tag != "rss":
+                raise ValueError(f"unexpected root element <{root.tag}>")
+            for event, elem in context:
+                if event != "end" or elem.tag != "item":
+                    continue
+                entry = _entry_from_item(elem)
+                root.find("channel").remove(elem)  # Drop parsed items so memory stays flat
+                yield entry
+                yielded_keys.add(entry["id"] or entry["link"])
+                if max_results is not None and len(yielded_keys) >= max_results:
+                    return  # Closing the response here skips the rest of the download
+            return
+        except (ElementTree.ParseError, ValueError):
+            # Fallback: let feedparser handle the whole download and skip what was already yielded
+            feed = feedparser.parse(reader.replay())
+
+    remaining = None if max_results is None else max_results - len(yielded_keys)
+    entries = [_entry_from_feedparser(entry) for entry in feed.entries]
+    entries = [entry for entry in entries if (entry["id"] or entry["link"]) not in yielded_keys]
+    for entry in entries[:remaining]:
+        yield entry
+
+
 # This function analyzes the sentiment of the text as Positive, Negative, or Neutral
 def get_sentiment(text: str) -> tuple:
     polarity = TextBlob(text).sentiment.polarity
@@ -70,22 +190,46 @@ def parse_news_query(query: str) -> str:
 
 
 # This function fetches news articles for a given keyword using Google's RSS feed.
-# It builds the RSS URL, parses the feed, and extracts the title, link, and published time
+# It builds the RSS URL, streams the feed (stopping early), and extracts the title, link, and published time
 # (formatted as "x days/hours/minutes ago") for up to `max_results` articles.
 # Returns a list of dictionaries with this information, or an empty list on error.
 def search_news_for_chat(keywords: str, max_results: int = 3) -> list:
     try:
         url = build_google_news_rss_url(keywords)
-        feed = feedparser.parse(url)
 
         articles = []
-        for entry in feed.entries[:max_results]:
+        for entry in iter_google_news_entries(url, max_results):
             articles.append({
-                "title": entry.title,
-                "link": entry.link,
-                "time_ago": format_time_ago(entry.get("published", ""))
+                "title": entry["title"],
+                "link": entry["link"],
+                "time_ago": format_time_ago(entry["published"])
             })
 
         return articles
     except Exception as e:
-        return []
\ No newline at end of file
+        return []
+
+
+# This function fills in sentiment, source icon and time ago for one article, in place.
+# Sentiment and source only depend on the title, so they are stored in `cache` (keyed by link)
+# and never recomputed; time ago is always fresh. Already enriched articles are left untouched.
+# If enrichment raises, the article is marked as failed instead of getting a made-up sentiment.
+def enrich_article(article: dict, cache: dict) -> dict:
+    if article.get("enriched"):
+        return article
+
+    key = article["link"]
+    try:
+        if key not in cache:
+            sentiment_text, sentiment_class = get_sentiment(article["title"])
+            cache[key] = {
+                "sentiment": sentiment_text,
+                "sentiment_class": sentiment_class,
+                "source_icon": get_source_icon(article["title"]),
+            }
+        article.update(cache[key])
+        article["time_ago"] = format_time_ago(article.get("published", ""))
+        article["enriched"] = True
+    except Exception:
+        article.update(FAILED_ENRICHMENT)
+    return article
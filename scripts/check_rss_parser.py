@@ -0,0 +1,70 @@
+"""Check the streaming Google News parser against feedparser and benchmark both.
+
+Run from the repository root:
+
+    python scripts/check_rss_parser.py [path/to/feed.xml]
+
+Defaults to the Google News RSS fixture in scripts/fixtures.
+"""
+import pathlib
+import sys
+import timeit
+import tracemalloc
+
+import feedparser
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+from news_utils import iter_google_news_entries, _entry_from_feedparser  # noqa: E402
+
+FIXTURE = pathlib.Path(__file__).resolve().parent / "fixtures" / "google_news_rss.xml"
+
+# Result sizes used by the app: the chat assistant, the slider maximum, and the whole feed
+RESULT_SIZES = [3, 20, None]
+
+
+def check_parity(url: str) -> bool:
+    """Compare the fast path with feedparser for every result size"""
+    expected = [_entry_from_feedparser(entry) for entry in feedparser.parse(url).entries]
+    ok = True
+    for max_results in RESULT_SIZES:
+        actual = list(iter_google_news_entries(url, max_results))
+        wanted = expected[:max_results]
+        if actual == wanted:
+            print(f"parity max_results={max_results}: OK ({len(actual)} entries)")
+            continue
+        ok = False
+        print(f"parity max_results={max_results}: MISMATCH ({len(actual)} vs {len(wanted)} entries)")
+        for index, (got, want) in enumerate(zip(actual, wanted)):
+            if got != want:
+                print(f"  first difference at entry {index}:\n    fast:       {got}\n    feedparser: {want}")
+                break
+    return ok
+
+
+def peak_allocation(func) -> int:
+    """Peak bytes allocated while running `func` once"""
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def benchmark(url: str, runs: int = 20):
+    """Report parse time and peak allocations for feedparser and the fast path"""
+    cases = [("feedparser (full feed)", lambda: feedparser.parse(url).entries)]
+    for max_results in RESULT_SIZES:
+        cases.append((f"fast path max_results={max_results}",
+                      lambda n=max_results: list(iter_google_news_entries(url, n))))
+
+    for label, func in cases:
+        seconds = min(timeit.repeat(func, number=1, repeat=runs))
+        print(f"{label:32} {seconds * 1000:8.2f} ms   peak {peak_allocation(func) / 1024:8.1f} KiB")
+
+
+if __name__ == "__main__":
+    path = pathlib.Path(sys.argv[1]) if len(sys.argv) > 1 else FIXTURE
+    feed_url = path.resolve().as_uri()
+    parity_ok = check_parity(feed_url)
+    benchmark(feed_url)
+    sys.exit(0 if parity_ok else 1)
@@ -6,6 +6,26 @@ from sklearn.feature_extraction.text import CountVectorizer
 import re
 import streamlit as st
 import io
+from functools import lru_cache
+
+
+# Name of the placeholder dataset inside every chart template.
+# Templates are compiled once, and only the aggregated rows are swapped in per render.
+CHART_DATA_NAME = "aggregated"
+
+
+@alt.theme.register("newsly", enable=True)
+def newsly_theme() -> alt.theme.ThemeConfig:
+    """Dark theme shared by every Altair chart in the app"""
+    # Registered once at import, so chart specs no longer repeat the
+    # axis/view/title styling on every call.
+    return {
+        "config": {
+            "axis": {"labelColor": "#e8eaed", "titleColor": "#e8eaed", "gridColor": "#5f6368"},
+            "view": {"fill": "#303134", "stroke": "#5f6368"},
+            "title": {"color": "#e8eaed", "fontSize": 16, "fontWeight": "bold"},
+        }
+    }
 
 
 def clean_text_for_analysis(text: str) -> str:
@@ -53,8 +73,63 @@ def create_word_cloud(articles: list) -> plt.Figure:
     return fig
 
 
-def create_keyword_frequency_chart(articles: list) -> alt.Chart:
-    """Create a horizontal bar chart of top keywords"""
+@lru_cache(maxsize=None)
+def keyword_chart_template() -> dict:
+    """Compile the keyword bar chart spec once, without any data"""
+    # Build a horizontal bar chart with Altair.
+    # The chart shows top keywords, styled with custom colors and the shared dark theme.
+    chart = alt.Chart(alt.Data(name=CHART_DATA_NAME)).mark_bar(color='#8ab4f8').encode(
+        x=alt.X('frequency:Q', title='Frequency'),
+        y=alt.Y('word:N', title='Keywords', sort='-x'),
+        tooltip=['word:N', 'frequency:Q']
+    ).properties(
+        width=600,
+        height=400,
+        title="Top Keywords in Headlines"
+    )
+    return chart.to_dict()
+
+
+@lru_cache(maxsize=None)
+def sentiment_chart_template() -> dict:
+    """Compile the sentiment bar chart spec once, without any data"""
+    # Define custom colors for each sentiment type (green=positive, grey=neutral, red=negative).
+    color_scale = alt.Scale(
+        domain=['Positive', 'Neutral', 'Negative'],
+        range=['#34a853', '#9aa0a6', '#ea4335']
+    )
+
+    # Build a bar chart showing how many articles fall into each sentiment.
+    chart = alt.Chart(alt.Data(name=CHART_DATA_NAME)).mark_bar().encode(
+        x=alt.X('Sentiment:N', title='Sentiment'),
+        y=alt.Y('Count:Q', title='Number of Articles'),
+        color=alt.Color('Sentiment:N', scale=color_scale, legend=None),
+        tooltip=['Sentiment:N', 'Count:Q']
+    ).properties(
+        width=400,
+        height=300,
+        title="Sentiment Distribution"
+    )
+    return chart.to_dict()
+
+
+CHART_TEMPLATES = {
+    "keywords": keyword_chart_template,
+    "sentiment": sentiment_chart_template,
+}
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def render_chart_spec(template: str, records: list) -> dict:
+    """Bind aggregated rows to a compiled template and return the Vega-Lite spec"""
+    # Streamlit caches the result by a hash of the arguments, so reruns with
+    # unchanged data reuse the spec instead of rebuilding it.
+    # The template is copied, never mutated, because it is shared across renders.
+    return {**CHART_TEMPLATES[template](), "data": {"values": records}}
+
+
+def aggregate_keyword_frequencies(articles: list) -> list:
+    """Count the top keywords across article titles"""
     # Combine article titles into one string and clean it
     # so we can extract word frequency using CountVectorizer.
     all_text = " ".join([article['title'] for article in articles])
@@ -74,97 +149,49 @@ def create_keyword_frequency_chart(articles: list) -> alt.Chart:
         feature_names = vectorizer.get_feature_names_out()
         frequencies = word_freq.toarray()[0]
 
-        # Create a DataFrame with words and their frequencies for plotting.
+        # Keep only the small word/frequency table, sorted for plotting.
         word_freq_df = pd.DataFrame({
             'word': feature_names,
             'frequency': frequencies
         }).sort_values('frequency', ascending=True)
-
-        # Build a horizontal bar chart with Altair.
-        # The chart shows top keywords, styled with custom colors and dark theme.
-        chart = alt.Chart(word_freq_df).mark_bar(color='#8ab4f8').encode(
-            x=alt.X('frequency:Q', title='Frequency'),
-            y=alt.Y('word:N', title='Keywords', sort='-x'),
-            tooltip=['word:N', 'frequency:Q']
-        ).properties(
-            width=600,
-            height=400,
-            title=alt.TitleParams(
-                text="Top Keywords in Headlines",
-                fontSize=16,
-                fontWeight='bold',
-                color='#e8eaed'
-            )
-        ).configure_axis(
-            labelColor='#e8eaed',
-            titleColor='#e8eaed',
-            gridColor='#5f6368'
-        ).configure_view(
-            fill='#303134',
-            stroke='#5f6368'
-        ).configure_title(
-            color='#e8eaed'
-        )
-
-        return chart
+        return [
+            {'word': word, 'frequency': int(frequency)}
+            for word, frequency in zip(word_freq_df['word'], word_freq_df['frequency'])
+        ]
     except Exception as e:
-        # If no meaningful words are found, return a placeholder chart
+        # If no meaningful words are found, return a placeholder row
         # so the app doesn’t crash and still shows a visual.
-        empty_df = pd.DataFrame({'word': ['No keywords found'], 'frequency': [0]})
-        return alt.Chart(empty_df).mark_bar().encode(
-            x='frequency:Q',
-            y='word:N'
-        ).properties(width=600, height=200)
+        return [{'word': 'No keywords found', 'frequency': 0}]
 
 
-def create_sentiment_distribution_chart(articles: list) -> alt.Chart:
-    """Create a bar chart showing sentiment distribution"""
+def aggregate_sentiment_counts(articles: list) -> list:
+    """Count how many articles fall into each sentiment"""
     # Loop through articles and count how many are Positive, Neutral, or Negative.
     # Strip emojis so only the text labels are counted.
+    # Articles whose enrichment failed have no sentiment, so they are skipped.
     sentiment_counts = {}
     for article in articles:
+        if article.get("enrichment_failed"):
+            continue
         sentiment = article['sentiment'].replace('😊 ', '').replace('😞 ', '').replace('😐 ', '')
         sentiment_counts[sentiment] = sentiment_counts.get(sentiment, 0) + 1
 
-    # Convert counts into a DataFrame for Altair plotting.
-    sentiment_df = pd.DataFrame([
+    return [
         {'Sentiment': sentiment, 'Count': count}
         for sentiment, count in sentiment_counts.items()
-    ])
+    ]
 
-    # Define custom colors for each sentiment type (green=positive, grey=neutral, red=negative).
-    color_scale = alt.Scale(
-        domain=['Positive', 'Neutral', 'Negative'],
-        range=['#34a853', '#9aa0a6', '#ea4335']
-    )
 
-    # Build a bar chart showing how many articles fall into each sentiment.
-    chart = alt.Chart(sentiment_df).mark_bar().encode(
-        x=alt.X('Sentiment:N', title='Sentiment'),
-        y=alt.Y('Count:Q', title='Number of Articles'),
-        color=alt.Color('Sentiment:N', scale=color_scale, legend=None),
-        tooltip=['Sentiment:N', 'Count:Q']
-    ).properties(
-        width=400,
-        height=300,
-        title=alt.TitleParams(
-            text="Sentiment Distribution",
-            fontSize=16,
-            fontWeight='bold',
-            color='#e8eaed'
-        )
-    ).configure_axis(
-        labelColor='#e8eaed',
-        titleColor='#e8eaed',
-        gridColor='#5f6368'
-    ).configure_view(
-        fill='#303134',
-        stroke='#5f6368'
-    ).configure_title(
-        color='#e8eaed'
-    )
+def create_keyword_frequency_chart(articles: list) -> dict:
+    """Create a horizontal bar chart spec of top keywords"""
+    # Only the aggregated word counts are sent to the browser, never the articles.
+    return render_chart_spec("keywords", aggregate_keyword_frequencies(articles))
+
 
-    return chart
+def create_sentiment_distribution_chart(articles: list) -> dict:
+    """Create a bar chart spec showing sentiment distribution"""
+    # Only the per-sentiment counts are sent to the browser, never the articles.
+    return render_chart_spec("sentiment", aggregate_sentiment_counts(articles))
 
 
 def render_insights_section(articles: list):
@@ -206,7 +233,7 @@ def render_insights_section(articles: list):
         st.markdown("Most common words and phrases in headlines")
         try:
             keyword_chart = create_keyword_frequency_chart(articles)
-            st.altair_chart(keyword_chart, use_container_width=True)
+            st.vega_lite_chart(keyword_chart, use_container_width=True)
         except Exception as e:
             st.error(f"Error creating keyword chart: {str(e)}")
 
@@ -216,6 +243,6 @@ def render_insights_section(articles: list):
         st.markdown("Distribution of positive, neutral, and negative coverage")
         try:
             sentiment_chart = create_sentiment_distribution_chart(articles)
-            st.altair_chart(sentiment_chart, use_container_width=True)
+            st.vega_lite_chart(sentiment_chart, use_container_width=True)
         except Exception as e:
             st.error(f"Error creating sentiment chart: {str(e)}")
\ No newline at end of file